@@ -2,31 +2,67 @@
 # Run: python app.py
 # Files expected in the SAME folder: train.csv
 
+import copy
+import os
+
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+from pyarrow import csv as pacsv
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output, State
+from flask_caching import Cache
 import plotly.express as px
 import plotly.graph_objects as go
 
 # ============= 1) LOAD + ENRICH DATA (OFFLINE) =============
-# Read your CSV (same folder as app.py)
-df = pd.read_csv("train.csv")
+# Read your CSV (same folder as app.py).
+# Only parse the columns the dashboard actually touches, at compact dtypes —
+# the default (every column, int64/float64/object) costs several times the RAM.
+# The lambda form of usecols tolerates CSVs that lack the optional columns.
+_USECOLS = {
+    "satisfaction", "Class", "Type of Travel", "Flight Distance", "Age",
+    "Departure Delay in Minutes", "Arrival Delay in Minutes",
+}
+if os.path.exists("train.parquet"):
+    # Parquet is columnar and keeps the dtypes from the writer, so this path
+    # skips CSV parsing entirely on warm starts (drop one next to train.csv
+    # via df.to_parquet("train.parquet", compression="zstd"))
+    df = pd.read_parquet("train.parquet")
+    df = df[[c for c in df.columns if c in _USECOLS]]
+else:
+    # Arrow's CSV reader parses with multiple threads (pd.read_csv is
+    # single-threaded); auto_dict_encode hands the string columns to pandas
+    # as categoricals straight away, so no astype pass afterwards. (The
+    # pandas 1.5 pin predates pd.ArrowDtype, hence the plain to_pandas.)
+    _tbl = pacsv.read_csv(
+        "train.csv",
+        convert_options=pacsv.ConvertOptions(
+            include_columns=sorted(_USECOLS),
+            include_missing_columns=True,  # optional columns arrive as nulls
+            strings_can_be_null=True,      # empty cells -> NaN, like pd.read_csv
+            column_types={
+                "Flight Distance": pa.float32(), "Age": pa.float32(),
+                "Departure Delay in Minutes": pa.float32(),
+                "Arrival Delay in Minutes": pa.float32(),
+            },
+            auto_dict_encode=True,
+        ),
+    )
+    df = _tbl.to_pandas(self_destruct=True)
+    del _tbl
 
 # --- Normalize satisfaction labels to just 2 buckets ---
-def normalize_satisfaction(val):
-    if pd.isna(val):
-        return "unknown"
-    s = str(val).strip().lower()
-    if "satisf" in s and "neutral" not in s and "diss" not in s:
-        return "satisfied"
-    if "neutral" in s or "diss" in s:
-        return "neutral or dissatisfied"
-    # fallback: anything else → bucket as neutral/diss
-    return "neutral or dissatisfied"
-
-df["satisfaction_norm"] = df["satisfaction"].apply(normalize_satisfaction)
+# vectorized (a few C-level string scans) instead of a python call per row
+_s = df["satisfaction"].astype(str).str.strip().str.lower()
+_is_sat = _s.str.contains("satisf") & ~_s.str.contains("neutral") & ~_s.str.contains("diss")
+df["satisfaction_norm"] = np.select(
+    [df["satisfaction"].isna(), _is_sat],
+    ["unknown", "satisfied"],
+    default="neutral or dissatisfied",  # fallback: anything else → bucket as neutral/diss
+)
+del _s, _is_sat
 
 # --- Simulate Airline names (expand/curate as you like) ---
 airlines = [
@@ -36,31 +72,185 @@ airlines = [
 np.random.seed(42)  # keep visuals deterministic between runs
 df["Airline"] = np.random.choice(airlines, size=len(df))
 
-# --- Simulate Flight Date over ~20 years (2006–2025) ---
-start_date = pd.Timestamp("2006-01-01")
-end_date   = pd.Timestamp("2025-08-01")  # close to "today" feel
-rand_seconds = np.random.randint(
-    start_date.value // 10**9,
-    end_date.value   // 10**9,
-    size=len(df)
-)
-df["Flight Date"] = pd.to_datetime(rand_seconds, unit="s")
-df["Year"] = df["Flight Date"].dt.year
+# --- Simulate Flight Year over ~20 years (2006–2025) ---
+# only Year is ever used downstream, so draw years directly instead of
+# building a full datetime64 column just to strip it back down to .dt.year
+df["Year"] = np.random.randint(2006, 2026, size=len(df), dtype=np.int16)
 
 # Some columns are optional in your CSV; guard missing
 for col in ["Class", "Type of Travel", "Flight Distance", "Age"]:
     if col not in df.columns:
         df[col] = np.nan
 
+# Rows with no Class / Type of Travel must still be counted whenever that
+# filter is cleared (the baseline mask passed them through), so bucket them
+# under a real "(missing)" category — as plain NaN they would code to -1 and
+# silently fall out of the cubes below
+_MISSING = "(missing)"
+for col in ["Class", "Type of Travel"]:
+    if df[col].isna().any():
+        if pd.api.types.is_categorical_dtype(df[col]):
+            df[col] = df[col].cat.add_categories(_MISSING)
+        df[col] = df[col].fillna(_MISSING)
+
+# --- Store the filter columns as categoricals ---
+# isin/groupby on a categorical compares small integer codes instead of
+# hashing python strings row by row — faster and a fraction of the RAM
+for col in ["Airline", "Class", "Type of Travel", "satisfaction_norm"]:
+    df[col] = df[col].astype("category")
+
+# --- Sort by Year so every "rows of year Y" slice is one contiguous block ---
+df = df.sort_values("Year", kind="stable", ignore_index=True)
+_year0 = int(df["Year"].iloc[0])
+_year_starts = df["Year"].to_numpy().searchsorted(
+    np.arange(_year0, int(df["Year"].iloc[-1]) + 2)
+)
+# row offsets per (Airline, Class, Type of Travel) combo; df is Year-sorted,
+# so each offset array is ascending and clipping it to a year block is just
+# two binary searches — no boolean mask over the full frame per tick
+_combo_rows = df.groupby(["Airline", "Class", "Type of Travel"], observed=True).indices
+
+def year_rows(current_year, airlines_sel, class_sel, travel_sel):
+    """Row offsets for exactly `current_year` under the dropdown filters."""
+    lo = _year_starts[current_year - _year0]
+    hi = _year_starts[current_year - _year0 + 1]
+    parts = []
+    # no `or A_CATS` fallback for airlines: the baseline applied isin()
+    # unconditionally there, so a cleared Airlines dropdown selects nothing
+    for a in (airlines_sel or ()):
+        for c in (class_sel or C_CATS):
+            for t in (travel_sel or T_CATS):
+                rows = _combo_rows.get((a, c, t))
+                if rows is not None:
+                    parts.append(rows[rows.searchsorted(lo):rows.searchsorted(hi)])
+    if not parts:
+        return np.empty(0, dtype=np.intp)
+    return np.concatenate(parts)
+
+# --- Precompute cumulative count/delay cubes (render fires every 0.5–2s) ---
+# One pass over the rows fills a small (year, airline, class, travel,
+# satisfaction) count cube; a cumsum along the year axis then turns every
+# "history ≤ year" number into a constant-time array lookup, so a tick never
+# scans the rows at all. (A numba prefix-sum kernel would do the same job,
+# but np.add.at + cumsum covers it without adding a JIT dependency.)
+A_CATS = df["Airline"].cat.categories
+C_CATS = df["Class"].cat.categories
+T_CATS = df["Type of Travel"].cat.categories
+S_CATS = df["satisfaction_norm"].cat.categories
+_N_YEARS = int(df["Year"].iloc[-1]) - _year0 + 1
+
+# every code is >= 0 by construction: Airline and satisfaction_norm are
+# always populated, and NaN in the optional filter columns was bucketed
+# under "(missing)" above — so no row falls out of the cubes
+_codes = (
+    (df["Year"].to_numpy() - _year0).astype(np.intp),
+    df["Airline"].cat.codes.to_numpy().astype(np.intp),
+    df["Class"].cat.codes.to_numpy().astype(np.intp),
+    df["Type of Travel"].cat.codes.to_numpy().astype(np.intp),
+    df["satisfaction_norm"].cat.codes.to_numpy().astype(np.intp),
+)
+
+COUNTS = np.zeros((_N_YEARS, len(A_CATS), len(C_CATS), len(T_CATS), len(S_CATS)), dtype=np.int64)
+np.add.at(COUNTS, _codes, 1)
+COUNTS_CUM = COUNTS.cumsum(axis=0)
+
+def _delay_cube(col):
+    """Cumulative (sum, non-null count) of delay minutes on the (year,
+    airline, class, travel) grid — the count cube is the mean's denominator,
+    so NaN delays stay out of it exactly like the baseline .mean()."""
+    # Arrow's include_missing_columns materializes absent columns as all
+    # nulls, so "all NaN" means the CSV never had the column — treat it the
+    # same as a missing column and let the KPI cards fall back to "-"
+    if col not in df.columns:
+        return None
+    vals = df[col].to_numpy(dtype=np.float64)
+    ok = ~np.isnan(vals)
+    if not ok.any():
+        return None
+    sums = np.zeros(COUNTS.shape[:4], dtype=np.float64)
+    np.add.at(sums, _codes[:4], np.where(ok, vals, 0.0))
+    cnts = np.zeros(COUNTS.shape[:4], dtype=np.int64)
+    np.add.at(cnts, _codes[:4], ok)
+    return sums.cumsum(axis=0), cnts.cumsum(axis=0)
+
+DEP_CUM, DEP_N = _delay_cube("Departure Delay in Minutes") or (None, None)
+ARR_CUM, ARR_N = _delay_cube("Arrival Delay in Minutes") or (None, None)
+del _codes
+
+# the delay columns are either there for the app's whole lifetime or not at
+# all — resolve that once here instead of re-checking inside the callback
+HAS_DEP = DEP_CUM is not None
+HAS_ARR = ARR_CUM is not None
+
+_SAT_I = S_CATS.get_loc("satisfied") if "satisfied" in S_CATS else None
+_DISS_I = S_CATS.get_loc("neutral or dissatisfied") if "neutral or dissatisfied" in S_CATS else None
+
+# reusable "all categories" code arrays — the common no-filter case then
+# allocates nothing per call (np.ix_ only reads them)
+_ALL_C = np.arange(len(C_CATS))
+_ALL_T = np.arange(len(T_CATS))
+_NO_SEL = np.empty(0, dtype=np.intp)
+
+def _sel_codes(sel, cats, default_codes):
+    """Dropdown selection -> sorted category code array.
+
+    An empty selection falls back to `default_codes`: all categories for
+    Class/Travel (the baseline's `else True` arm), the empty array for
+    Airline (the baseline applied `isin` unconditionally there, so clearing
+    that dropdown means no rows).
+    """
+    if not sel:
+        return default_codes
+    codes = cats.get_indexer(sel)
+    return np.sort(codes[codes >= 0])
+
 # ============= 2) DASH APP SETUP =============
 app = dash.Dash(__name__)
 server = app.server  # 🎯 CRITICAL LINE FOR DEPLOYMENT
 app.title = "Offline Live Airline Satisfaction"
 
+# play mode loops over the same ~20 years with unchanged filters, so cache the
+# serialized figure JSON per (year, filters) — after one full loop every tick
+# is answered from memory instead of rebuilding + re-serializing 4 figures
+cache = Cache(server, config={"CACHE_TYPE": "SimpleCache"})
+
 # Slider bounds
 year_min = int(df["Year"].min())
 year_max = int(df["Year"].max())
 
+# Distinct values for the dropdowns, computed once — .cat.categories is the
+# already-deduplicated list, so no O(N) .unique() scans at layout build time.
+# The "(missing)" bucket stays out of the options, like the baseline's
+# .dropna(): those rows only show up when the Class/Travel filter is cleared.
+AIRLINES = sorted(A_CATS)
+CLASSES  = sorted(c for c in C_CATS if c != _MISSING)
+TRAVELS  = sorted(t for t in T_CATS if t != _MISSING)
+
+# --- Static figure skeletons ---
+# Plotly Express re-resolves colors, category orders and axis config on every
+# call. Build the trace/layout scaffolding for the three aggregate figures
+# once; each tick only deep-copies the small JSON dict and fills in data+title.
+def _fig_skeletons():
+    top = go.Figure([
+        go.Bar(name="satisfied", x=[], y=[]),
+        go.Bar(name="neutral or dissatisfied", x=[], y=[]),
+    ])
+    top.update_layout(barmode="stack", margin=dict(l=20,r=20,t=60,b=20),
+                      legend_title_text="", xaxis_title="Airline", yaxis_title="Count")
+
+    trend = go.Figure([
+        go.Scatter(name="satisfied", mode="lines+markers", x=[], y=[]),
+        go.Scatter(name="neutral or dissatisfied", mode="lines+markers", x=[], y=[]),
+    ])
+    trend.update_layout(xaxis_title="Year", yaxis_title="Count",
+                        margin=dict(l=20,r=20,t=60,b=20))
+
+    pie = go.Figure([go.Pie(labels=[], values=[], hole=0.3)])
+
+    return top.to_plotly_json(), trend.to_plotly_json(), pie.to_plotly_json()
+
+_TOP_SKEL, _TREND_SKEL, _PIE_SKEL = _fig_skeletons()
+
 def kpi_card(title, value, sub=None):
     return html.Div([
         html.Div(title, className="text-sm text-gray-500"),
@@ -82,8 +272,8 @@ app.layout = html.Div([
             html.Label("Airlines"),
             dcc.Dropdown(
                 id="airline-dd",
-                options=[{"label": a, "value": a} for a in sorted(df["Airline"].unique())],
-                value=sorted(df["Airline"].unique())[:6],  # preselect a handful
+                options=[{"label": a, "value": a} for a in AIRLINES],
+                value=AIRLINES[:6],  # preselect a handful
                 multi=True
             ),
         ], style={"width":"32%","display":"inline-block","verticalAlign":"top","paddingRight":"12px"}),
@@ -92,8 +282,8 @@ app.layout = html.Div([
             html.Label("Class"),
             dcc.Dropdown(
                 id="class-dd",
-                options=[{"label": c, "value": c} for c in sorted(df["Class"].dropna().unique())],
-                value=sorted(df["Class"].dropna().unique()),
+                options=[{"label": c, "value": c} for c in CLASSES],
+                value=CLASSES,
                 multi=True
             ),
         ], style={"width":"32%","display":"inline-block","verticalAlign":"top","paddingRight":"12px"}),
@@ -102,8 +292,8 @@ app.layout = html.Div([
             html.Label("Type of Travel"),
             dcc.Dropdown(
                 id="travel-dd",
-                options=[{"label": t, "value": t} for t in sorted(df["Type of Travel"].dropna().unique())],
-                value=sorted(df["Type of Travel"].dropna().unique()),
+                options=[{"label": t, "value": t} for t in TRAVELS],
+                value=TRAVELS,
                 multi=True
             ),
         ], style={"width":"32%","display":"inline-block","verticalAlign":"top"}),
@@ -157,6 +347,7 @@ app.layout = html.Div([
     # Hidden "engine" parts
     dcc.Interval(id="tick", interval=1000, n_intervals=0, disabled=False),  # default = playing
     dcc.Store(id="play-state", data=True),    # True=playing, False=paused
+    dcc.Store(id="last-view", data=None),     # (year, filters) last actually drawn
 ], style={"fontFamily":"Inter, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, sans-serif",
           "background":"#f7f7fb","minHeight":"100vh"})
 
@@ -179,57 +370,73 @@ def toggle_play(n_clicks, is_playing):
 def set_speed(interval_ms):
     return interval_ms
 
+@app.callback(
+    Output("tick", "disabled"),
+    Input("play-state", "data"),
+)
+def pause_tick(is_playing):
+    return not is_playing
+
+# Advance the year in the browser: the play loop is pure modular arithmetic,
+# so there's no reason to round-trip to the server every tick. The heavy
+# render callback below only runs when the slider value actually changes.
+app.clientside_callback(
+    f"""
+    function(n, isPlaying, current) {{
+        if (!isPlaying) {{ return window.dash_clientside.no_update; }}
+        var ymin = {year_min}, ymax = {year_max};
+        var y = (current == null) ? ymin : current + 1;
+        return (y > ymax) ? ymin : y;
+    }}
+    """,
+    Output("year-slider", "value"),
+    Input("tick", "n_intervals"),
+    State("play-state", "data"),
+    State("year-slider", "value"),
+    # without this the callback fires at n_intervals=0 on page load and
+    # advances past year_min before its frame is ever shown
+    prevent_initial_call=True,
+)
+
 
 # ============= 5) MAIN UPDATE LOOP =============
 @app.callback(
     [
-        Output("year-slider", "value"),
         Output("current-year-label", "children"),
         Output("kpi-row", "children"),
         Output("facet-graph", "figure"),
         Output("top-airlines-graph", "figure"),
         Output("yearly-trend-graph", "figure"),
         Output("pie-graph", "figure"),
-        Output("tick", "disabled"),
+        Output("last-view", "data"),
     ],
     [
-        Input("tick", "n_intervals"),
         Input("year-slider", "value"),
         Input("airline-dd", "value"),
         Input("class-dd", "value"),
         Input("travel-dd", "value"),
-        Input("play-state", "data"),
     ],
+    State("last-view", "data"),
 )
-def render(n, slider_year, airlines_sel, class_sel, travel_sel, is_playing):
-    # compute current "live" year
-    # when playing -> advance with n_intervals; when paused -> stick to slider year
-    if is_playing:
-        # loop years smoothly
-        span = (year_max - year_min + 1)
-        current_year = year_min + (n % span)
-        slider_val = current_year
-    else:
-        current_year = slider_year
-        slider_val = slider_year
-
-    # filter by controls + current year (use <= to build history feel)
-    mask = (
-        df["Airline"].isin(airlines_sel) &
-        (df["Class"].isin(class_sel) if class_sel else True) &
-        (df["Type of Travel"].isin(travel_sel) if travel_sel else True) &
-        (df["Year"] <= current_year)
+def render(current_year, airlines_sel, class_sel, travel_sel, last_view):
+    # the dropdown lists arrive in click order, so sort them once here —
+    # this is both the dedupe key and the memoize key
+    view = [
+        current_year,
+        sorted(airlines_sel or ()),
+        sorted(class_sel or ()),
+        sorted(travel_sel or ()),
+    ]
+    # a slider drag that lands on the same year (or a dropdown re-emit with
+    # an identical selection) resolves to the view already on screen —
+    # skip the rebuild and the figure transfer entirely
+    if view == last_view:
+        return (dash.no_update,) * 7
+
+    kpi_vals, facet_fig, top_fig, trend_fig, pie_fig = build_view(
+        current_year, tuple(view[1]), tuple(view[2]), tuple(view[3])
     )
-    d = df.loc[mask].copy()
-
-    # ---- KPIs ----
-    total_records = len(d)
-    sat_counts = d["satisfaction_norm"].value_counts()
-    sat = int(sat_counts.get("satisfied", 0))
-    diss = int(sat_counts.get("neutral or dissatisfied", 0))
-    sat_pct = (sat / max(1, sat + diss)) * 100
-    avg_delay_dep = float(d.get("Departure Delay in Minutes", pd.Series(dtype=float)).mean()) if "Departure Delay in Minutes" in d else np.nan
-    avg_delay_arr = float(d.get("Arrival Delay in Minutes", pd.Series(dtype=float)).mean()) if "Arrival Delay in Minutes" in d else np.nan
+    total_records, sat, diss, sat_pct, avg_delay_dep, avg_delay_arr = kpi_vals
 
     kpis = [
         kpi_card("Total Records (≤ year)", f"{total_records:,}"),
@@ -239,10 +446,53 @@ def render(n, slider_year, airlines_sel, class_sel, travel_sel, is_playing):
         kpi_card("Current Year", str(current_year)),
     ]
 
+    return (
+        f"Current Year: {current_year}",
+        kpis,
+        facet_fig,
+        top_fig,
+        trend_fig,
+        pie_fig,
+        view,
+    )
+
+
+@cache.memoize()
+def build_view(current_year, airlines_sel, class_sel, travel_sel):
+    """KPI numbers + the four figures (as JSON dicts) for one year/filter combo.
+
+    Cached: Dash accepts the JSON dicts directly as `figure` values, so a
+    cache hit skips both the figure construction and its serialization.
+    """
+    airlines_sel, class_sel, travel_sel = list(airlines_sel), list(class_sel), list(travel_sel)
+
+    # constant-time history lookup: index the cumulative cubes at the current
+    # year and the selected category codes — no row scan, no groupby
+    yi = current_year - _year0
+    box = np.ix_(
+        _sel_codes(airlines_sel, A_CATS, _NO_SEL),
+        _sel_codes(class_sel, C_CATS, _ALL_C),
+        _sel_codes(travel_sel, T_CATS, _ALL_T),
+    )
+    hist = COUNTS_CUM[yi][box]       # (airline, class, travel, satisfaction)
+
+    # ---- KPIs (pure sums on the small cube; avg delay = sum/count) ----
+    total_records = int(hist.sum())
+    sat_by = hist.sum(axis=(0, 1, 2))
+    sat = int(sat_by[_SAT_I]) if _SAT_I is not None else 0
+    diss = int(sat_by[_DISS_I]) if _DISS_I is not None else 0
+    sat_pct = (sat / max(1, sat + diss)) * 100
+    # divide by the non-null delay count, not total_records — rows with a
+    # missing delay stay out of the denominator, matching Series.mean()
+    dep_n = int(DEP_N[yi][box].sum()) if HAS_DEP else 0
+    arr_n = int(ARR_N[yi][box].sum()) if HAS_ARR else 0
+    avg_delay_dep = float(DEP_CUM[yi][box].sum() / dep_n) if dep_n else np.nan
+    avg_delay_arr = float(ARR_CUM[yi][box].sum() / arr_n) if arr_n else np.nan
+
     # ---- Facet: Satisfaction per Class by Airline (only current year slice for clarity) ----
-    d_year = d[d["Year"] == current_year]
-    if d_year.empty:
-        d_year = d.tail(0)  # keep schema
+    # the facet histogram is the one figure that still needs row-level data;
+    # take only the current-year rows via the precomputed offset arrays
+    d_year = df.take(year_rows(current_year, airlines_sel, class_sel, travel_sel))
 
     facet_fig = px.histogram(
         d_year, x="Class", color="satisfaction_norm", facet_col="Airline",
@@ -254,54 +504,44 @@ def render(n, slider_year, airlines_sel, class_sel, travel_sel, is_playing):
     facet_fig.update_layout(margin=dict(l=20,r=20,t=60,b=20))
 
     # ---- Top Airlines (stacked) over history ≤ current year ----
-    grp = d.groupby(["Airline","satisfaction_norm"]).size().unstack(fill_value=0)
+    grp = pd.DataFrame(hist.sum(axis=(1, 2)), index=A_CATS[box[0].ravel()], columns=S_CATS)
     if "satisfied" not in grp.columns: grp["satisfied"] = 0
     if "neutral or dissatisfied" not in grp.columns: grp["neutral or dissatisfied"] = 0
     grp = grp.assign(Total=grp["satisfied"] + grp["neutral or dissatisfied"]).sort_values("Total", ascending=False)
-    top_fig = px.bar(
-        grp.reset_index(),
-        x="Airline",
-        y=["satisfied","neutral or dissatisfied"],
-        barmode="stack",
-        title=f"Top Airlines by Satisfaction (≤ {current_year})",
-        labels={"value":"Count"}
-    )
-    top_fig.update_layout(margin=dict(l=20,r=20,t=60,b=20), legend_title_text="")
+    top_fig = copy.deepcopy(_TOP_SKEL)
+    top_fig["data"][0]["x"] = top_fig["data"][1]["x"] = grp.index.tolist()
+    top_fig["data"][0]["y"] = grp["satisfied"].tolist()
+    top_fig["data"][1]["y"] = grp["neutral or dissatisfied"].tolist()
+    top_fig["layout"]["title"] = {"text": f"Top Airlines by Satisfaction (≤ {current_year})"}
 
     # ---- Yearly Trend (history ≤ current year) ----
-    year_trend = d.groupby("Year")["satisfaction_norm"].value_counts().unstack(fill_value=0).reset_index()
-    if year_trend.empty:
-        year_trend = pd.DataFrame({"Year":[current_year], "satisfied":[0], "neutral or dissatisfied":[0]})
-    trend_fig = go.Figure()
-    if "satisfied" in year_trend:
-        trend_fig.add_trace(go.Scatter(x=year_trend["Year"], y=year_trend["satisfied"], mode="lines+markers", name="satisfied"))
-    if "neutral or dissatisfied" in year_trend:
-        trend_fig.add_trace(go.Scatter(x=year_trend["Year"], y=year_trend["neutral or dissatisfied"], mode="lines+markers", name="neutral or dissatisfied"))
-    trend_fig.update_layout(
-        title=f"Yearly Satisfaction Trend (≤ {current_year})",
-        xaxis_title="Year", yaxis_title="Count",
-        margin=dict(l=20,r=20,t=60,b=20)
+    year_trend = pd.DataFrame(
+        COUNTS[: yi + 1][(slice(None),) + box].sum(axis=(1, 2, 3)),
+        index=np.arange(_year0, current_year + 1), columns=S_CATS,
     )
+    for col in ("satisfied", "neutral or dissatisfied"):
+        if col not in year_trend.columns:
+            year_trend[col] = 0
+    trend_fig = copy.deepcopy(_TREND_SKEL)
+    trend_fig["data"][0]["x"] = trend_fig["data"][1]["x"] = year_trend.index.tolist()
+    trend_fig["data"][0]["y"] = year_trend["satisfied"].tolist()
+    trend_fig["data"][1]["y"] = year_trend["neutral or dissatisfied"].tolist()
+    trend_fig["layout"]["title"] = {"text": f"Yearly Satisfaction Trend (≤ {current_year})"}
 
     # ---- Pie (current year snapshot) ----
-    pie_counts = d_year["satisfaction_norm"].value_counts()
-    pie_fig = px.pie(
-        names=pie_counts.index, values=pie_counts.values,
-        hole=0.3, title=f"Satisfaction Split — Year {current_year}"
-    )
-
-    # disable interval only if paused
-    interval_disabled = not is_playing
+    pie_counts = pd.Series(COUNTS[yi][box].sum(axis=(0, 1, 2)), index=S_CATS)
+    pie_counts = pie_counts[pie_counts > 0]
+    pie_fig = copy.deepcopy(_PIE_SKEL)
+    pie_fig["data"][0]["labels"] = pie_counts.index.tolist()
+    pie_fig["data"][0]["values"] = pie_counts.tolist()
+    pie_fig["layout"]["title"] = {"text": f"Satisfaction Split — Year {current_year}"}
 
     return (
-        slider_val,
-        f"Current Year: {current_year}",
-        kpis,
-        facet_fig,
+        (total_records, sat, diss, sat_pct, avg_delay_dep, avg_delay_arr),
+        facet_fig.to_plotly_json(),
         top_fig,
         trend_fig,
         pie_fig,
-        interval_disabled
     )
 
 
@@ -1,3 +1,4 @@
+import io
 import pandas as pd
 import os
 import requests
@@ -22,30 +23,32 @@ def fetch_and_save_data():
         url = bts_download_url.format(year, month)
         print(f"Downloading from: {url}")
         
-        response = requests.get(url)
-        response.raise_for_status()
-
-        zip_file_path = os.path.join(raw_data_dir, f"ontime_{year}_{month:02d}.zip")
-        with open(zip_file_path, 'wb') as f:
-            f.write(response.content)
-        print(f"✅ Downloaded ZIP file saved to: {zip_file_path}")
-
-        with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-            csv_file_name = zip_ref.namelist()[0]
-            with zip_ref.open(csv_file_name) as csv_file:
-                bts_df = pd.read_csv(csv_file, low_memory=False)
-
         # Select only the most relevant columns to keep the dataset manageable
         relevant_columns = [
-            'FlightDate', 'Airline', 'Origin', 'Dest', 
+            'FlightDate', 'Airline', 'Origin', 'Dest',
             'DepDelayMinutes', 'ArrDelayMinutes', 'Cancelled', 'Diverted'
         ]
-        # Only keep columns that actually exist in the downloaded data
-        available_columns = [col for col in relevant_columns if col in bts_df.columns]
-        bts_df = bts_df[available_columns]
 
-        bts_df.to_csv(f"{raw_data_dir}/bts_delays.csv", index=False)
-        print("✅ Saved BTS Delays data to data/raw/bts_delays.csv")
+        # Parse the ZIP straight from memory — no temp file on disk, and the
+        # lambda usecols means the 100+ unused BTS columns are never parsed
+        # (it also silently skips any listed column missing from the download)
+        response = requests.get(url, stream=True)
+        response.raise_for_status()
+        buf = io.BytesIO(response.content)
+
+        with zipfile.ZipFile(buf) as zip_ref:
+            csv_file_name = zip_ref.namelist()[0]
+            with zip_ref.open(csv_file_name) as csv_file:
+                bts_df = pd.read_csv(
+                    csv_file,
+                    usecols=lambda c: c in relevant_columns,
+                    dtype={'DepDelayMinutes': 'float32', 'ArrDelayMinutes': 'float32'}
+                )
+
+        # Parquet keeps the dtypes (no re-parsing of dates/floats downstream),
+        # compresses ~5-10x better than CSV, and loads much faster
+        bts_df.to_parquet(f"{raw_data_dir}/bts_delays.parquet", compression="zstd", index=False)
+        print("✅ Saved BTS Delays data to data/raw/bts_delays.parquet")
         print(f"Dataset shape: {bts_df.shape}")
 
     except Exception as e:
@@ -103,7 +106,7 @@ def create_simulated_bts_data(raw_data_dir):
         'Diverted': np.random.choice([True, False], 1000, p=[0.01, 0.99])
     }
     bts_df = pd.DataFrame(bts_data)
-    bts_df.to_csv(f"{raw_data_dir}/bts_delays.csv", index=False)
+    bts_df.to_parquet(f"{raw_data_dir}/bts_delays.parquet", compression="zstd", index=False)
     print("✅ Created simulated BTS data as fallback")
 
 if __name__ == "__main__":
@@ -10,8 +10,12 @@ def load_and_clean_data():
     print("Loading and cleaning data...")
     
     try:
-        # Load the raw data
-        bts_df = pd.read_csv("../data/raw/bts_delays.csv")
+        # Load the raw data (Parquet from data_fetch; fall back to a CSV
+        # left over from older runs)
+        if os.path.exists("../data/raw/bts_delays.parquet"):
+            bts_df = pd.read_parquet("../data/raw/bts_delays.parquet")
+        else:
+            bts_df = pd.read_csv("../data/raw/bts_delays.csv")
         satisfaction_df = pd.read_csv("../data/raw/satisfaction.csv")
         
         print(f"BTS data shape: {bts_df.shape}")
@@ -47,9 +51,16 @@ def load_and_clean_data():
             'neutral or dissatisfied': 0
         })
         
-        # Aggregate BTS data by airline
+        # Aggregate BTS data by airline — one .agg call so pandas makes a
+        # single pass per column. The flag columns get cast to int8 first so
+        # their means run through the fast numeric kernels instead of the
+        # bool/object fallback. (engine="numba" was tried here, but pandas
+        # only supports it for single-function aggs, not a named multi-agg.)
         print("Aggregating BTS data by airline...")
-        airline_performance = bts_df.groupby('Airline_Name').agg(
+        for flag_col in ['Cancelled', 'Diverted']:
+            if flag_col in bts_df.columns:
+                bts_df[flag_col] = bts_df[flag_col].astype('int8')
+        airline_performance = bts_df.groupby('Airline_Name', observed=True).agg(
             Total_Flights=('Airline', 'count'),
             Average_Departure_Delay=('DepDelayMinutes', 'mean'),
             Average_Arrival_Delay=('ArrDelayMinutes', 'mean'),
@@ -71,32 +82,33 @@ def load_and_clean_data():
             'Eco Plus': ['Frontier Airlines', 'Spirit Air Lines', 'Allegiant Air']
         }
         
-        # Create final merged dataset
+        # Create final merged dataset via two hash joins instead of nested
+        # Python loops appending dicts row by row
         print("Creating final merged dataset...")
-        merged_data = []
-        for airline_class, airlines in class_to_airline.items():
-            class_data = satisfaction_agg[satisfaction_agg['Class'] == airline_class].copy()
-            for airline in airlines:
-                airline_data = airline_performance[airline_performance['Airline_Name'] == airline].copy()
-                if not airline_data.empty:
-                    merged_row = {
-                        'Airline': airline,
-                        'Airline_Class': airline_class,
-                        'Avg_Satisfaction_Score': class_data['Avg_Satisfaction_Score'].values[0],
-                        'Total_Surveys': class_data['Total_Surveys'].values[0],
-                        'Total_Flights': airline_data['Total_Flights'].values[0],
-                        'Avg_Departure_Delay': airline_data['Average_Departure_Delay'].values[0],
-                        'Avg_Arrival_Delay': airline_data['Average_Arrival_Delay'].values[0],
-                        'Cancellation_Rate': airline_data['Cancellation_Rate'].values[0],
-                        'Diversion_Rate': airline_data['Diversion_Rate'].values[0]
-                    }
-                    merged_data.append(merged_row)
-        
-        final_df = pd.DataFrame(merged_data)
+        mapping_df = pd.DataFrame(
+            [(cls, airline) for cls, airlines in class_to_airline.items() for airline in airlines],
+            columns=['Class', 'Airline_Name']
+        )
+        final_df = (
+            satisfaction_agg
+            .merge(mapping_df, on='Class')
+            .merge(airline_performance, on='Airline_Name')  # inner: drops airlines without BTS rows
+            .rename(columns={
+                'Class': 'Airline_Class',
+                'Airline_Name': 'Airline',
+                'Average_Departure_Delay': 'Avg_Departure_Delay',
+                'Average_Arrival_Delay': 'Avg_Arrival_Delay'
+            })
+        )
+        final_df = final_df[[
+            'Airline', 'Airline_Class', 'Avg_Satisfaction_Score', 'Total_Surveys',
+            'Total_Flights', 'Avg_Departure_Delay', 'Avg_Arrival_Delay',
+            'Cancellation_Rate', 'Diversion_Rate'
+        ]]
         
         # Save the final processed data
-        final_df.to_csv(f"{processed_data_dir}/merged_data.csv", index=False)
-        print("✅ Cleaned and merged data saved to data/processed/merged_data.csv")
+        final_df.to_parquet(f"{processed_data_dir}/merged_data.parquet", compression="zstd", index=False)
+        print("✅ Cleaned and merged data saved to data/processed/merged_data.parquet")
         print(f"Final dataset shape: {final_df.shape}")
         print("\nFinal data preview:")
         print(final_df.to_string())